@@ -494,6 +494,44 @@ class ParserMediator(object):
 
     self.last_activity_timestamp = time.time()
 
+  def ProduceEventDataBatch(self, event_data_batch):
+    """Produces a batch of event data.
+
+    This is equivalent to calling ProduceEventData() for every event data in
+    the batch, except that values that are the same for the entire batch are
+    retrieved only once.
+
+    Args:
+      event_data_batch (list[EventData]): event data.
+
+    Raises:
+      RuntimeError: when storage writer is not set.
+    """
+    if not self._storage_writer:
+      raise RuntimeError('Storage writer not set.')
+
+    add_attribute_container = self._storage_writer.AddAttributeContainer
+    event_data_stream = self._event_data_stream
+    event_data_stream_identifier = self._event_data_stream_identifier
+    parser_chain = self.GetParserChain()
+
+    for event_data in event_data_batch:
+      if not getattr(event_data, '_parser_chain', None):
+        setattr(event_data, '_parser_chain', parser_chain)
+
+      if event_data_stream_identifier:
+        event_data.SetEventDataStreamIdentifier(event_data_stream_identifier)
+
+      event_values_hash = events.CalculateEventValuesHash(
+          event_data, event_data_stream)
+      setattr(event_data, '_event_values_hash', event_values_hash)
+
+      add_attribute_container(event_data)
+
+    self._number_of_event_data += len(event_data_batch)
+
+    self.last_activity_timestamp = time.time()
+
   def ProduceEventDataStream(self, event_data_stream):
     """Produces an event data stream.
 
@@ -2,6 +2,8 @@
 """Parser for binary and text Property List (plist) files."""
 
 import binascii
+import collections
+import os
 import plistlib
 
 from xml.parsers import expat
@@ -22,6 +24,10 @@ class PlistParser(interface.FileObjectParser):
   # 50 MB is 10x larger than any plist file seen to date.
   _MAXIMUM_FILE_SIZE = 50000000
 
+  _HEADER_SIZE = 8
+
+  _MAXIMUM_CACHED_REQUIRED_FORMATS = 128
+
   _UTF16BE_BYTE_ORDER_MARK = b'\xfe\xff'
   _UTF16LE_BYTE_ORDER_MARK = b'\xff\xfe'
   _UTF32BE_BYTE_ORDER_MARK = b'\x00\x00\xfe\xff'
@@ -30,6 +36,11 @@ class PlistParser(interface.FileObjectParser):
 
   _plugin_classes = {}
 
+  def __init__(self):
+    """Initializes a plist parser."""
+    super(PlistParser, self).__init__()
+    self._cached_required_formats = collections.OrderedDict()
+
   def _CheckByteOrderMark(self, plist_data):
     """Determines if the plist data starts with a byte-order-mark.
 
@@ -60,6 +71,58 @@ class PlistParser(interface.FileObjectParser):
 
     return 0, 'ascii'
 
+  def _CheckHeader(self, header_data):
+    """Determines if the header data can be the start of a plist.
+
+    Args:
+      header_data (bytes): header data.
+
+    Returns:
+      bool: True if the header data can be the start of a binary or XML plist.
+    """
+    if header_data.startswith(b'bplist'):
+      return True
+
+    byte_order_mark_size, _ = self._CheckByteOrderMark(header_data)
+    if byte_order_mark_size:
+      return True
+
+    # An XML plist can have leading whitespace.
+    header_data = header_data.lstrip()
+    return not header_data or header_data.startswith(b'<')
+
+  def _GetCachedRequiredFormats(self, top_level_object):
+    """Retrieves the cached results of the plugin format checks.
+
+    The results of the format checks are cached per set of top-level keys,
+    since plists with the same keys, such as preference files of different
+    users, match the same plugins.
+
+    Args:
+      top_level_object (object): plist top-level item.
+
+    Returns:
+      dict[str, bool]: results of the format checks per plugin name, which is
+          not cached if the top-level item is not a dictionary.
+    """
+    if not isinstance(top_level_object, dict):
+      return {}
+
+    lookup_key = frozenset(top_level_object.keys())
+
+    required_formats = self._cached_required_formats.get(lookup_key, None)
+    if required_formats is None:
+      if (len(self._cached_required_formats) >=
+          self._MAXIMUM_CACHED_REQUIRED_FORMATS):
+        self._cached_required_formats.popitem(last=True)
+
+      required_formats = {}
+      self._cached_required_formats[lookup_key] = required_formats
+
+    self._cached_required_formats.move_to_end(lookup_key, last=False)
+
+    return required_formats
+
   @classmethod
   def GetFormatSpecification(cls):
     """Retrieves the format specification.
@@ -82,9 +145,20 @@ class PlistParser(interface.FileObjectParser):
     Raises:
       WrongParser: when the file cannot be parsed.
     """
+    # First pass check for the signature of a binary plist or the start of
+    # an XML plist, to prevent reading and parsing files that are not a plist.
+    header_data = file_object.read(self._HEADER_SIZE)
+    if not self._CheckHeader(header_data):
+      raise errors.WrongParser('Unsupported plist header.')
+
+    file_object.seek(0, os.SEEK_SET)
+
     filename = parser_mediator.GetFilename()
 
     # Note that _MAXIMUM_FILE_SIZE prevents this read to become too large.
+    # The plist data is read at once since plistlib reads binary plists with
+    # a seek and read per object, which is slower on dfVFS file-like objects
+    # than parsing the data from memory.
     plist_data = file_object.read()
 
     has_leading_whitespace = False
@@ -145,6 +219,8 @@ class PlistParser(interface.FileObjectParser):
     display_name = parser_mediator.GetDisplayName()
     filename_lower_case = filename.lower()
 
+    required_formats = self._GetCachedRequiredFormats(top_level_object)
+
     found_matching_plugin = False
     for plugin_name, plugin in self._plugins_per_name.items():
       if parser_mediator.abort:
@@ -155,20 +231,28 @@ class PlistParser(interface.FileObjectParser):
       parser_mediator.SampleFormatCheckStartTiming(profiling_name)
 
       try:
-        if not plugin.PLIST_PATH_FILTERS:
-          path_filter_match = True
-        else:
-          path_filter_match = False
-          for path_filter in plugin.PLIST_PATH_FILTERS:
-            if path_filter.Match(filename_lower_case):
-              path_filter_match = True
-
-        try:
-          required_format = plugin.CheckRequiredFormat(top_level_object)
-        except Exception as exception:  # pylint: disable=broad-except
-          parser_mediator.ProduceExtractionWarning((
-              'plugin: {0:s} unable to parse plist file with error: '
-              '{1!s}').format(plugin_name, exception))
+        path_filter_match = not plugin.PLIST_PATH_FILTERS
+        for path_filter in plugin.PLIST_PATH_FILTERS:
+          if path_filter.Match(filename_lower_case):
+            path_filter_match = True
+            break
+
+        # Checking the path filters is cheaper than checking the format hence
+        # the format is only checked for plugins with matching path filters.
+        required_format = False
+        if path_filter_match:
+          required_format = required_formats.get(plugin_name, None)
+
+        if required_format is None:
+          try:
+            required_format = plugin.CheckRequiredFormat(top_level_object)
+            required_formats[plugin_name] = required_format
+
+          except Exception as exception:  # pylint: disable=broad-except
+            parser_mediator.ProduceExtractionWarning((
+                'plugin: {0:s} unable to parse plist file with error: '
+                '{1!s}').format(plugin_name, exception))
+            required_format = False
 
       finally:
         parser_mediator.SampleFormatCheckStopTiming(profiling_name)
@@ -861,6 +861,9 @@ class PlistPlugin(plugins.BasePlugin):
   def CheckRequiredFormat(self, top_level):
     """Check if the plist has the minimal structure required by the plugin.
 
+    Note that the plist parser caches the result per set of top-level keys,
+    hence the result should only depend on the keys of the top-level item.
+
     Args:
       top_level (dict[str, object]): plist top-level item.
 
@@ -18,8 +18,11 @@ class EncodedTextReader(object):
 
   Attributes:
     line_number (int): current line number.
-    lines (str): lines of text.
-    lines_size (int): size of the lines of text.
+    lines_buffer (str): buffer of lines of text, that includes text that has
+        already been consumed.
+    lines_offset (int): offset of the lines of text that have not been
+        consumed in the lines buffer.
+    lines_size (int): size of the lines of text that have not been consumed.
   """
 
   BUFFER_SIZE = 65536
@@ -43,20 +46,34 @@ class EncodedTextReader(object):
         file_object, errors=encoding_errors)
 
     self.line_number = 0
-    self.lines = ''
+    self.lines_buffer = ''
+    self.lines_offset = 0
     self.lines_size = 0
 
+  @property
+  def lines(self):
+    """str: lines of text that have not been consumed."""
+    return self.lines_buffer[self.lines_offset:]
+
   def ReadLine(self):
     """Reads a line.
 
     Returns:
       str: line read from the lines buffer.
     """
-    if not self.lines:
+    if not self.lines_size:
       self.ReadLines()
 
-    line, _, self.lines = self.lines.partition('\n')
-    self.lines_size += len(line) + 1
+    end_offset = self.lines_buffer.find('\n', self.lines_offset)
+    if end_offset == -1:
+      end_offset = len(self.lines_buffer)
+      next_offset = end_offset
+    else:
+      next_offset = end_offset + 1
+
+    line = self.lines_buffer[self.lines_offset:end_offset]
+    self.lines_offset = next_offset
+    self.lines_size = len(self.lines_buffer) - next_offset
     self.line_number += 1
 
     return line
@@ -78,7 +95,11 @@ class EncodedTextReader(object):
         decoded_data = '\n'.join([
             line.rstrip('\r') for line in decoded_data.split('\n')])
 
-        self.lines = ''.join([self.lines, decoded_data])
+        # Text that has been consumed is only removed from the lines buffer
+        # when it is refilled, instead of for every line that is consumed.
+        self.lines_buffer = ''.join([
+            self.lines_buffer[self.lines_offset:], decoded_data])
+        self.lines_offset = 0
         self.lines_size += len(decoded_data)
 
   def SkipAhead(self, number_of_characters):
@@ -90,7 +111,8 @@ class EncodedTextReader(object):
     while number_of_characters >= self.lines_size:
       number_of_characters -= self.lines_size
 
-      self.lines = ''
+      self.lines_buffer = ''
+      self.lines_offset = 0
       self.lines_size = 0
 
       self.ReadLines()
@@ -98,8 +120,10 @@ class EncodedTextReader(object):
       if self.lines_size == 0:
         return
 
-    self.line_number += self.lines[:number_of_characters].count('\n')
-    self.lines = self.lines[number_of_characters:]
+    end_offset = self.lines_offset + number_of_characters
+    self.line_number += self.lines_buffer.count(
+        '\n', self.lines_offset, end_offset)
+    self.lines_offset = end_offset
     self.lines_size -= number_of_characters
 
   # Note: that the following functions do not follow the style guide
@@ -164,8 +164,8 @@ class AndroidLogcatTextPlugin(
       _END_OF_LINE)
 
   _LINE_STRUCTURES = [
-      ('beginning_line', _BEGINNING_LINE),
-      ('log_line', _LOG_LINE)]
+      ('log_line', _LOG_LINE),
+      ('beginning_line', _BEGINNING_LINE)]
 
   VERIFICATION_GRAMMAR = _BEGINNING_LINE ^ _LOG_LINE
 
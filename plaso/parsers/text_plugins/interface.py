@@ -13,6 +13,27 @@ from plaso.parsers import plugins
 from plaso.parsers import text_parser
 
 
+# Packrat memoization of pyparsing can be enabled by setting the
+# PLASO_PYPARSING_CACHE environment variable to the size of the cache, where
+# a size of 0 represents an unbounded cache. It is disabled by default since
+# the line structures have few alternatives that share sub expressions and
+# the memoization overhead outweighs the benefit.
+_PYPARSING_CACHE_SIZE = os.getenv('PLASO_PYPARSING_CACHE', None)
+
+if _PYPARSING_CACHE_SIZE:
+  try:
+    _cache_size_limit = int(_PYPARSING_CACHE_SIZE, 10)
+  except ValueError:
+    _cache_size_limit = -1
+
+  if _cache_size_limit < 0:
+    logger.warning('Unsupported PLASO_PYPARSING_CACHE value: {0:s}'.format(
+        _PYPARSING_CACHE_SIZE))
+  else:
+    pyparsing.ParserElement.enable_packrat(
+        cache_size_limit=_cache_size_limit or None)
+
+
 class TextPlugin(plugins.BasePlugin):
   """The interface for text plugins."""
 
@@ -22,7 +43,9 @@ class TextPlugin(plugins.BasePlugin):
   ENCODING = None
 
   # List of tuples of pyparsing expression per unique identifier that define
-  # the supported grammar.
+  # the supported grammar. The line structures are tried in order and the first
+  # match is used, hence the most frequent line structure should be defined
+  # first.
   _LINE_STRUCTURES = []
 
   # PyParsing grammer used to verify the text-log file format. Note that since
@@ -38,6 +61,7 @@ class TextPlugin(plugins.BasePlugin):
     """Initializes a parser."""
     super(TextPlugin, self).__init__()
     self._current_offset = 0
+    self._line_structure_grammars = {}
     self._parser_mediator = None
     self._pyparsing_grammar = None
 
@@ -89,6 +113,23 @@ class TextPlugin(plugins.BasePlugin):
 
     return None
 
+  def _GetLineStructureKey(self, string, offset=0):  # pylint: disable=unused-argument
+    """Determines the line structure to parse a string with.
+
+    Plugins with line structures that can be distinguished cheaply, for
+    example by their first character, can override this method to parse
+    a string with a single line structure instead of trying all of them.
+
+    Args:
+      string (str): string.
+      offset (Optional[int]): offset in the string of the text to parse.
+
+    Returns:
+      str: name of the line structure or None if all line structures should be
+          tried.
+    """
+    return None
+
   def _GetStringValueFromStructure(self, structure, name):
     """Retrieves a string value from a Pyparsing structure.
 
@@ -168,18 +209,28 @@ class TextPlugin(plugins.BasePlugin):
           '{1!s}').format(self._current_offset, exception))
       return
 
-    while text_reader.lines:
+    # Bind the methods called per line to local variables to prevent repeated
+    # attribute lookups.
+    parse_record = self._ParseRecord
+    parse_string = self._ParseString
+    read_lines = text_reader.ReadLines
+    skip_ahead = text_reader.SkipAhead
+
+    maximum_consecutive_line_failures = self._MAXIMUM_CONSECUTIVE_LINE_FAILURES
+
+    while text_reader.lines_size:
       if parser_mediator.abort:
         break
 
-      if consecutive_line_failures > self._MAXIMUM_CONSECUTIVE_LINE_FAILURES:
+      if consecutive_line_failures > maximum_consecutive_line_failures:
         parser_mediator.ProduceExtractionWarning(
             'more than {0:d} consecutive failures to parse lines.'.format(
-                self._MAXIMUM_CONSECUTIVE_LINE_FAILURES))
+                maximum_consecutive_line_failures))
         break
 
       try:
-        key, structure, _, end = self._ParseString(text_reader.lines)
+        key, structure, _, end = parse_string(
+            text_reader.lines_buffer, text_reader.lines_offset)
 
       except errors.ParseError as exception:
         line = text_reader.ReadLine()
@@ -206,17 +257,17 @@ class TextPlugin(plugins.BasePlugin):
 
       try:
         # TODO: use a callback per key.
-        self._ParseRecord(parser_mediator, key, structure)
+        parse_record(parser_mediator, key, structure)
 
       except errors.ParseError as exception:
         parser_mediator.ProduceExtractionWarning(
             'unable to parse record: {0:s} with error: {1!s}'.format(
                 key, exception))
 
-      text_reader.SkipAhead(end)
+      skip_ahead(end)
 
       try:
-        text_reader.ReadLines()
+        read_lines()
         self._current_offset = text_reader.get_offset()
       except UnicodeDecodeError as exception:
         parser_mediator.ProduceExtractionWarning((
@@ -238,42 +289,106 @@ class TextPlugin(plugins.BasePlugin):
       ParseError: when the structure type is unknown.
     """
 
-  def _ParseString(self, string):
+  def _ParseString(self, string, offset=0):
     """Parses a string for known grammar.
 
     Args:
       string (str): string.
+      offset (Optional[int]): offset in the string of the text to parse.
 
     Returns:
       tuple[str, pyparsing.ParseResults, int, int]: key, parsed tokens, start
-          and end offset.
+          and end offset relative to the offset of the text to parse.
 
     Raises:
       ParseError: when the string cannot be parsed by the grammar.
     """
-    try:
-      structure_generator = self._pyparsing_grammar.scan_string(
-          string, max_matches=1)
-      structure, start, end = next(structure_generator)
+    key = self._GetLineStructureKey(string, offset)
+    if key is None:
+      pyparsing_grammar = self._pyparsing_grammar
+    else:
+      pyparsing_grammar = self._line_structure_grammars.get(key, None)
+      if not pyparsing_grammar:
+        raise errors.ParseError('Unsupported line structure: {0!s}.'.format(
+            key))
+
+    # Note that scan_string() is not used here since it tries to match
+    # the grammar at every offset of the string until a match is found.
+    # pylint: disable=protected-access
+    pyparsing.ParserElement.reset_cache()
 
-    except StopIteration:
-      structure = None
+    try:
+      start = pyparsing_grammar.preParse(string, offset)
+      end, structure = pyparsing_grammar._parse(
+          string, start, callPreParse=False)
+
+    except pyparsing.ParseException:
+      # The line can contain leading characters, such as a tab, that are not
+      # part of the grammar, hence try to match all line structures at other
+      # offsets of the first line.
+      newline_offset = string.find('\n', offset)
+      if newline_offset == -1:
+        last_offset = len(string)
+      else:
+        last_offset = newline_offset - 1
 
-    except pyparsing.ParseException as exception:
-      raise errors.ParseError(exception)
+      key = None
+      structure, start, end = self._ScanString(string, offset, last_offset)
 
     if not structure:
       raise errors.ParseError('No match found.')
 
-    if start > 0 and '\n' in string[:start + 1]:
-      raise errors.ParseError('Found a line preceeding match.')
+    # Unwrap the line structure and retrieve its name (key), unless the name
+    # is already known.
+    if key is None:
+      keys = list(structure.keys())
+      if len(keys) != 1:
+        raise errors.ParseError('Missing key of line structructure.')
 
-    # Unwrap the line structure and retrieve its name (key).
-    keys = list(structure.keys())
-    if len(keys) != 1:
-      raise errors.ParseError('Missing key of line structructure.')
+      key = keys[0]
 
-    return keys[0], structure[0], start, end
+    return key, structure[0], start - offset, end - offset
+
+  def _ScanString(self, string, offset, last_offset):
+    """Scans a string for known grammar.
+
+    This is equivalent to scan_string() with a single match, except that only
+    matches that start from the offset up to and including the last offset
+    are tried.
+
+    Args:
+      string (str): string.
+      offset (int): offset in the string of the text to scan.
+      last_offset (int): last offset in the string where a match can start.
+
+    Returns:
+      tuple[pyparsing.ParseResults, int, int]: parsed tokens, start and end
+          offset in the string.
+
+    Raises:
+      ParseError: when the text cannot be parsed by the grammar.
+    """
+    pyparsing_grammar = self._pyparsing_grammar
+
+    while offset <= last_offset:
+      start = pyparsing_grammar.preParse(string, offset)
+      if start > last_offset:
+        break
+
+      try:
+        # pylint: disable=protected-access
+        end, structure = pyparsing_grammar._parse(
+            string, start, callPreParse=False)
+
+      except pyparsing.ParseException:
+        end = offset
+
+      if end > offset:
+        return structure, start, end
+
+      offset = start + 1
+
+    raise errors.ParseError('No match found.')
 
   def _SetLineStructures(self, line_structures):
     """Sets the line structures.
@@ -282,6 +397,7 @@ class TextPlugin(plugins.BasePlugin):
       line_structures ([(str, pyparsing.ParserElement)]): tuples of pyparsing
           expressions to parse a line and their names.
     """
+    self._line_structure_grammars = {}
     self._pyparsing_grammar = None
 
     for key, expression in line_structures:
@@ -290,15 +406,23 @@ class TextPlugin(plugins.BasePlugin):
       if not isinstance(expression, pyparsing.Group):
         expression = pyparsing.Group(expression).set_results_name(key)
 
+      # Keep the grammar per line structure for when the line structure can be
+      # determined upfront, see _GetLineStructureKey().
+      self._line_structure_grammars[key] = expression
+
+      # Note that MatchFirst (|) is used instead of Or (^) since the latter
+      # tries every line structure to determine the longest match.
       if not self._pyparsing_grammar:
         self._pyparsing_grammar = expression
       else:
-        self._pyparsing_grammar ^= expression
+        self._pyparsing_grammar |= expression
 
     # Override Pyparsing's default replacement of tabs with spaces to
     # SkipAhead() the correct number of bytes after a match.
     self._pyparsing_grammar.parse_with_tabs()
 
+    self._pyparsing_grammar.streamline()
+
     # Override Pyparsing's whitespace characters to spaces only.
     self._pyparsing_grammar.set_default_whitespace_chars(' ')
 
@@ -398,15 +522,16 @@ class TextPluginWithLineContinuation(TextPlugin):
     super(TextPluginWithLineContinuation, self).__init__()
     self._last_string_match = None
 
-  def _ParseString(self, string):
+  def _ParseString(self, string, offset=0):
     """Parses a string for known grammar.
 
     Args:
       string (str): string.
+      offset (Optional[int]): offset in the string of the text to parse.
 
     Returns:
       tuple[str, pyparsing.ParseResults, int, int]: key, parsed tokens, start
-          and end offset.
+          and end offset relative to the offset of the text to parse.
 
     Raises:
       ParseError: when the string cannot be parsed by the grammar.
@@ -416,27 +541,24 @@ class TextPluginWithLineContinuation(TextPlugin):
       self._last_string_match = None
       return last_string_match
 
+    pyparsing.ParserElement.reset_cache()
+
     try:
-      structure_generator = self._pyparsing_grammar.scan_string(
-          string, max_matches=1)
-      structure, start, end = next(structure_generator)
+      structure, start, end = self._ScanString(string, offset, len(string))
 
-    except StopIteration:
+    except errors.ParseError:
       structure = None
 
-    except pyparsing.ParseException as exception:
-      raise errors.ParseError(exception)
-
     if not structure:
-      return '_line_continuation', string, 0, len(string)
+      return '_line_continuation', string[offset:], 0, len(string) - offset
 
     # Unwrap the line structure and retrieve its name (key).
     keys = list(structure.keys())
     if len(keys) != 1:
       raise errors.ParseError('Missing key of line structructure.')
 
-    if start == 0:
-      return keys[0], structure[0], start, end
+    if start == offset:
+      return keys[0], structure[0], 0, end - offset
 
     self._last_string_match = (keys[0], structure[0], 0, end - start)
-    return '_line_continuation', string[:start], 0, start
+    return '_line_continuation', string[offset:start], 0, start - offset
@@ -184,9 +184,9 @@ class PopularityContestTextPlugin(interface.TextPlugin):
       _END_OF_LINE)
 
   _LINE_STRUCTURES = [
+      ('log_line', _LOG_LINE),
       ('footer_line', _FOOTER_LINE),
-      ('header_line', _HEADER_LINE),
-      ('log_line', _LOG_LINE)]
+      ('header_line', _HEADER_LINE)]
 
   VERIFICATION_GRAMMAR = _HEADER_LINE
 
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Text parser plugin for Windows Firewall Log files."""
 
+import re
+
 import pyparsing
 
 from dfdatetime import time_elements as dfdatetime_time_elements
@@ -67,36 +69,54 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
   # A Windows Firewall is encoded using the system codepage.
   ENCODING = None
 
-  _TWO_DIGITS = pyparsing.Word(pyparsing.nums, exact=2).set_parse_action(
-      lambda tokens: int(tokens[0], 10))
+  # Using regular expressions here is faster than pyparsing sub expressions.
+  # The regular expressions are also used to parse log lines without
+  # the pyparsing grammar.
+  _DATE_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+
+  _TIME_RE = re.compile(r'([0-9]{2}):([0-9]{2}):([0-9]{2})')
+
+  # The IP address regular expression matches the same IPv4 and full, mixed
+  # and short IPv6 address forms as pyparsing_common.ipv4_address and
+  # pyparsing_common.ipv6_address, except for the maximum number of parts of
+  # the short IPv6 address form, which is checked separately.
+  _IPV4_ADDRESS_PATTERN = (
+      r'(?:25[0-5]|2[0-4][0-9]|1?[0-9]{1,2})'
+      r'(?:\.(?:25[0-5]|2[0-4][0-9]|1?[0-9]{1,2})){3}')
 
-  _FOUR_DIGITS = pyparsing.Word(pyparsing.nums, exact=4).set_parse_action(
-      lambda tokens: int(tokens[0], 10))
+  _IPV6_ADDRESS_PART_PATTERN = r'[0-9a-fA-F]{1,4}'
 
-  _DATE = pyparsing.Group(
-      _FOUR_DIGITS + pyparsing.Suppress('-') +
-      _TWO_DIGITS + pyparsing.Suppress('-') + _TWO_DIGITS)
+  _IP_ADDRESS_RE = re.compile((
+      r'{0:s}|{1:s}(?::{1:s}){{7}}|::ffff:{0:s}|'
+      r'(?:{1:s}(?::{1:s}){{0,6}})?::(?:{1:s}(?::{1:s}){{0,6}})?').format(
+          _IPV4_ADDRESS_PATTERN, _IPV6_ADDRESS_PART_PATTERN))
 
-  _TIME = pyparsing.Group(
-      _TWO_DIGITS + pyparsing.Suppress(':') +
-      _TWO_DIGITS + pyparsing.Suppress(':') + _TWO_DIGITS)
+  _DATE = pyparsing.Regex(
+      _DATE_RE.pattern, as_group_list=True).set_parse_action(
+          lambda tokens: [tuple(int(value, 10) for value in tokens[0])])
 
-  _ACTION = pyparsing.Word(pyparsing.alphanums + '-', min=2)
+  _TIME = pyparsing.Regex(
+      _TIME_RE.pattern, as_group_list=True).set_parse_action(
+          lambda tokens: [tuple(int(value, 10) for value in tokens[0])])
 
-  _WORD_OR_BLANK = (
-      pyparsing.Word(pyparsing.alphanums) | pyparsing.Suppress('-'))
+  # Note that a single regular expression per value and blank is used instead
+  # of a MatchFirst of pyparsing sub expressions to reduce the number of
+  # expressions tried per field. Parse actions that return an empty list
+  # suppress the blank value.
+  _ACTION = pyparsing.Regex(r'[0-9A-Za-z-]{2,}')
+
+  _WORD_OR_BLANK = pyparsing.Regex(r'[0-9A-Za-z]+|-').set_parse_action(
+      lambda tokens: [] if tokens[0] == '-' else tokens)
 
   _IP_ADDRESS_OR_BLANK = (
       pyparsing.pyparsing_common.ipv4_address |
       pyparsing.pyparsing_common.ipv6_address | pyparsing.Suppress('-'))
 
-  _PORT_NUMBER_OR_BLANK = (
-      pyparsing.Word(pyparsing.nums, max=6).set_parse_action(
-          lambda tokens: int(tokens[0], 10)) | pyparsing.Suppress('-'))
+  _PORT_NUMBER_OR_BLANK = pyparsing.Regex(r'[0-9]{1,6}|-').set_parse_action(
+      lambda tokens: [] if tokens[0] == '-' else [int(tokens[0], 10)])
 
-  _INTEGER_OR_BLANK = (
-      pyparsing.Word(pyparsing.nums).set_parse_action(
-          lambda tokens: int(tokens[0], 10)) | pyparsing.Suppress('-'))
+  _INTEGER_OR_BLANK = pyparsing.Regex(r'[0-9]+|-').set_parse_action(
+      lambda tokens: [] if tokens[0] == '-' else [int(tokens[0], 10)])
 
   _END_OF_LINE = pyparsing.Suppress(pyparsing.LineEnd())
 
@@ -137,6 +157,46 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
       _WORD_OR_BLANK.set_results_name('path') +
       _END_OF_LINE)
 
+  _LOG_LINE_1_5_FIELDS = [
+      'date', 'time', 'action', 'protocol', 'src-ip', 'dst-ip', 'src-port',
+      'dst-port', 'size', 'tcpflags', 'tcpsyn', 'tcpack', 'tcpwin', 'icmptype',
+      'icmpcode', 'info', 'path']
+
+  # Names and value types of the fields, used to parse log lines without
+  # the pyparsing grammar.
+  _LOG_LINE_FIELDS = {
+      'action': ('action', 'action'),
+      'date': ('date', 'date'),
+      'dst-ip': ('destination_ip', 'ip_address'),
+      'dst-port': ('destination_port', 'port_number'),
+      'icmpcode': ('icmp_code', 'integer'),
+      'icmptype': ('icmp_type', 'integer'),
+      'info': ('information', 'word'),
+      'path': ('path', 'word'),
+      'protocol': ('protocol', 'word'),
+      'size': ('packet_size', 'integer'),
+      'src-ip': ('source_ip', 'ip_address'),
+      'src-port': ('source_port', 'port_number'),
+      'tcpack': ('tcp_ack', 'integer'),
+      'tcpflags': ('tcp_flags', 'word'),
+      'tcpsyn': ('tcp_sequence_number', 'integer'),
+      'tcpwin': ('tcp_window_size', 'integer'),
+      'time': ('time', 'time')}
+
+  # Names of the event data attributes that are set from the tokens of a log
+  # line with the same name.
+  _EVENT_DATA_ATTRIBUTE_NAMES = (
+      'action', 'destination_ip', 'destination_port', 'icmp_code', 'icmp_type',
+      'information', 'packet_size', 'path', 'protocol', 'source_ip',
+      'source_port', 'tcp_ack', 'tcp_flags', 'tcp_sequence_number',
+      'tcp_window_size')
+
+  _ACTION_CHARACTERS = frozenset(pyparsing.alphanums + '-')
+
+  _DIGITS = frozenset(pyparsing.nums)
+
+  _WORD_CHARACTERS = frozenset(pyparsing.alphanums)
+
   # Common fields. Set results name with underscores, not hyphens because regex
   # will not pick them up.
 
@@ -159,9 +219,14 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
       'tcpwin': _INTEGER_OR_BLANK.set_results_name('tcp_window_size'),
       'time': _TIME.set_results_name('time')}
 
+  # Number of event data to produce at once.
+  _EVENT_DATA_BATCH_SIZE = 256
+
   _HEADER_GRAMMAR = pyparsing.OneOrMore(_COMMENT_LOG_LINE)
 
-  _LINE_STRUCTURES = [('log_line', _LOG_LINE_1_5)]
+  _LINE_STRUCTURES = [
+      ('log_line', _LOG_LINE_1_5),
+      ('comment_line', _COMMENT_LOG_LINE)]
 
   VERIFICATION_GRAMMAR = (
       pyparsing.ZeroOrMore(
@@ -173,7 +238,74 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
   def __init__(self):
     """Initializes a text parser plugin."""
     super(WinFirewallLogTextPlugin, self).__init__()
+    self._event_data_batch = []
+    self._log_line_fields = []
+    self._record_parsers = {
+        'comment_line': self._ParseMetadata,
+        'log_line': self._ParseLogLine}
     self._use_local_time = False
+    self._value_parsers = {
+        'action': self._ParseActionValue,
+        'date': self._ParseDateValue,
+        'integer': self._ParseIntegerValue,
+        'ip_address': self._ParseIPAddressValue,
+        'port_number': self._ParsePortNumberValue,
+        'time': self._ParseTimeValue,
+        'word': self._ParseWordValue}
+
+    self._SetLogLineFields(self._LOG_LINE_1_5_FIELDS)
+
+  def _GetLineStructureKey(self, string, offset=0):
+    """Determines the line structure to parse a string with.
+
+    Args:
+      string (str): string.
+      offset (Optional[int]): offset in the string of the text to parse.
+
+    Returns:
+      str: name of the line structure or None if all line structures should be
+          tried.
+    """
+    if string[offset:offset + 1] == '#':
+      return 'comment_line'
+
+    return 'log_line'
+
+  def _ParseActionValue(self, value):
+    """Parses an action value of a log line.
+
+    Args:
+      value (str): value of the field.
+
+    Returns:
+      str: action.
+
+    Raises:
+      ValueError: if the value is not supported.
+    """
+    if len(value) < 2 or not self._ACTION_CHARACTERS.issuperset(value):
+      raise ValueError('Unsupported action value.')
+
+    return value
+
+  def _ParseDateValue(self, value):
+    """Parses a date value of a log line.
+
+    Args:
+      value (str): value of the field formatted as: YYYY-MM-DD
+
+    Returns:
+      tuple[int, int, int]: year, month and day of month.
+
+    Raises:
+      ValueError: if the value is not supported.
+    """
+    regex_match = self._DATE_RE.fullmatch(value)
+    if not regex_match:
+      raise ValueError('Unsupported date value.')
+
+    year, month, day_of_month = regex_match.groups()
+    return int(year, 10), int(month, 10), int(day_of_month, 10)
 
   def _ParseFieldsMetadata(self, parser_mediator, fields):
     """Parses the fields metadata and updates the log line definition to match.
@@ -183,11 +315,10 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
           and other components, such as storage and dfVFS.
       fields (str): field definitions.
     """
-    log_line_structure = pyparsing.Empty()
-    for member in fields.split(' '):
-      if not member:
-        continue
+    members = [member for member in fields.split(' ') if member]
 
+    log_line_structure = pyparsing.Empty()
+    for member in members:
       field_structure = self._LOG_LINE_STRUCTURES.get(member, None)
       if not field_structure:
         field_structure = self._WORD_OR_BLANK
@@ -199,7 +330,20 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
 
     log_line_structure += self._END_OF_LINE
 
-    self._SetLineStructures([('log_line', log_line_structure)])
+    self._SetLineStructures([
+        ('log_line', log_line_structure),
+        ('comment_line', self._COMMENT_LOG_LINE)])
+
+    self._SetLogLineFields(members)
+
+  def _ParseFinalize(self, parser_mediator):
+    """Finalizes parsing.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+    """
+    self._ProduceEventDataBatch(parser_mediator)
 
   def _ParseHeader(self, parser_mediator, text_reader):
     """Parses a text-log file header.
@@ -226,51 +370,114 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
     if not structure or start != 0:
       raise errors.ParseError('No match found.')
 
-    fields = self._GetValueFromStructure(structure, 'fields', default_value='')
-    fields = fields.strip()
-    if fields:
-      self._ParseFieldsMetadata(parser_mediator, fields)
-
-    time_format = self._GetValueFromStructure(
-        structure, 'time_format', default_value='')
-    self._use_local_time = time_format.lower() == 'local'
+    self._ParseMetadata(parser_mediator, structure)
 
     text_reader.SkipAhead(end)
 
+  def _ParseIntegerValue(self, value):
+    """Parses an integer value of a log line.
+
+    Args:
+      value (str): value of the field.
+
+    Returns:
+      int: integer or None if blank.
+
+    Raises:
+      ValueError: if the value is not supported.
+    """
+    if value == '-':
+      return None
+
+    if not value or not self._DIGITS.issuperset(value):
+      raise ValueError('Unsupported integer value.')
+
+    return int(value, 10)
+
+  def _ParseIPAddressValue(self, value):
+    """Parses an IP address value of a log line.
+
+    Args:
+      value (str): value of the field.
+
+    Returns:
+      str: IP address or None if blank.
+
+    Raises:
+      ValueError: if the value is not supported.
+    """
+    if value == '-':
+      return None
+
+    if not self._IP_ADDRESS_RE.fullmatch(value):
+      raise ValueError('Unsupported IP address value.')
+
+    # The short IPv6 address form supports a maximum of 7 parts.
+    if '::' in value and len([part for part in value.split(':') if part]) > 7:
+      raise ValueError('Unsupported IP address value.')
+
+    return value
+
   def _ParseLogLine(self, parser_mediator, structure):
     """Parse a single log line.
 
     Args:
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfVFS.
-      structure (pyparsing.ParseResults): tokens from a parsed log line.
+      structure (dict[str, object]|pyparsing.ParseResults): tokens from
+          a parsed log line.
     """
     event_data = WinFirewallEventData()
-    event_data.action = self._GetValueFromStructure(structure, 'action')
-    event_data.destination_ip = self._GetValueFromStructure(
-        structure, 'destination_ip')
-    event_data.destination_port = self._GetValueFromStructure(
-        structure, 'destination_port')
-    event_data.icmp_code = self._GetValueFromStructure(structure, 'icmp_code')
-    event_data.icmp_type = self._GetValueFromStructure(structure, 'icmp_type')
-    event_data.information = self._GetValueFromStructure(
-        structure, 'information')
+    # Note that the tokens of a log line are never an empty ParseResults hence
+    # _GetValueFromStructure() is not needed here.
+    get_value = structure.get
+    event_data.CopyFromDict({
+        name: get_value(name, None)
+        for name in self._EVENT_DATA_ATTRIBUTE_NAMES})
     event_data.last_written_time = self._ParseTimeElements(structure)
-    event_data.path = self._GetValueFromStructure(structure, 'path')
-    event_data.protocol = self._GetValueFromStructure(structure, 'protocol')
-    event_data.packet_size = self._GetValueFromStructure(
-        structure, 'packet_size')
-    event_data.source_ip = self._GetValueFromStructure(structure, 'source_ip')
-    event_data.source_port = self._GetValueFromStructure(
-        structure, 'source_port')
-    event_data.tcp_ack = self._GetValueFromStructure(structure, 'tcp_ack')
-    event_data.tcp_flags = self._GetValueFromStructure(structure, 'tcp_flags')
-    event_data.tcp_sequence_number = self._GetValueFromStructure(
-        structure, 'tcp_sequence_number')
-    event_data.tcp_window_size = self._GetValueFromStructure(
-        structure, 'tcp_window_size')
-
-    parser_mediator.ProduceEventData(event_data)
+
+    self._event_data_batch.append(event_data)
+    if len(self._event_data_batch) >= self._EVENT_DATA_BATCH_SIZE:
+      self._ProduceEventDataBatch(parser_mediator)
+
+  def _ParseMetadata(self, parser_mediator, structure):
+    """Parses metadata from comment lines.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+      structure (dict[str, str]|pyparsing.ParseResults): tokens from parsed
+          comment lines.
+    """
+    fields = self._GetValueFromStructure(structure, 'fields', default_value='')
+    fields = fields.strip()
+    if fields:
+      self._ParseFieldsMetadata(parser_mediator, fields)
+
+    time_format = self._GetValueFromStructure(
+        structure, 'time_format', default_value='')
+    if time_format:
+      self._use_local_time = time_format.lower() == 'local'
+
+  def _ParsePortNumberValue(self, value):
+    """Parses a port number value of a log line.
+
+    Args:
+      value (str): value of the field.
+
+    Returns:
+      int: port number or None if blank.
+
+    Raises:
+      ValueError: if the value is not supported.
+    """
+    if value == '-':
+      return None
+
+    if not value or len(value) > 6 or not self._DIGITS.issuperset(value):
+      raise ValueError('Unsupported port number value.')
+
+    return int(value, 10)
 
   def _ParseRecord(self, parser_mediator, key, structure):
     """Parses a pyparsing structure.
@@ -279,18 +486,60 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
       parser_mediator (ParserMediator): mediates interactions between parsers
           and other components, such as storage and dfVFS.
       key (str): name of the parsed structure.
-      structure (pyparsing.ParseResults): tokens from a parsed log line.
+      structure (dict[str, object]|pyparsing.ParseResults): tokens from
+          a parsed log line.
 
     Raises:
       ParseError: if the structure cannot be parsed.
     """
-    self._ParseLogLine(parser_mediator, structure)
+    parse_record = self._record_parsers.get(key, None)
+    if not parse_record:
+      raise errors.ParseError(
+          'Unable to parse record, unknown structure: {0:s}'.format(key))
+
+    parse_record(parser_mediator, structure)
+
+  def _ParseString(self, string, offset=0):
+    """Parses a string for known grammar.
+
+    Comment and log lines are split into fields directly since this is
+    significantly faster than using the pyparsing grammar. The grammar is used
+    for log lines that cannot be split into supported field values.
+
+    Args:
+      string (str): string.
+      offset (Optional[int]): offset in the string of the text to parse.
+
+    Returns:
+      tuple[str, object, int, int]: key, parsed tokens, start and end offset
+          relative to the offset of the text to parse.
+
+    Raises:
+      ParseError: when the string cannot be parsed by the grammar.
+    """
+    end = string.find('\n', offset)
+    if end == -1:
+      line = string[offset:]
+      end = len(string) - offset
+    else:
+      line = string[offset:end]
+      end += 1 - offset
+
+    if line[:1] == '#':
+      return 'comment_line', self._SplitCommentLine(line), 0, end
+
+    structure = self._SplitLogLine(line)
+    if structure is not None:
+      return 'log_line', structure, 0, end
+
+    return super(WinFirewallLogTextPlugin, self)._ParseString(string, offset)
 
   def _ParseTimeElements(self, structure):
     """Parses date and time elements of a log line.
 
     Args:
-      structure (pyparsing.ParseResults): tokens from a parsed log line.
+      structure (dict[str, object]|pyparsing.ParseResults): tokens from
+          a parsed log line.
 
     Returns:
       dfdatetime.TimeElements: date and time value.
@@ -318,11 +567,120 @@ class WinFirewallLogTextPlugin(interface.TextPlugin):
       raise errors.ParseError(
           'Unable to parse time elements with error: {0!s}'.format(exception))
 
+  def _ParseTimeValue(self, value):
+    """Parses a time value of a log line.
+
+    Args:
+      value (str): value of the field formatted as: hh:mm:ss
+
+    Returns:
+      tuple[int, int, int]: hours, minutes and seconds.
+
+    Raises:
+      ValueError: if the value is not supported.
+    """
+    regex_match = self._TIME_RE.fullmatch(value)
+    if not regex_match:
+      raise ValueError('Unsupported time value.')
+
+    hours, minutes, seconds = regex_match.groups()
+    return int(hours, 10), int(minutes, 10), int(seconds, 10)
+
+  def _ParseWordValue(self, value):
+    """Parses a word value of a log line.
+
+    Args:
+      value (str): value of the field.
+
+    Returns:
+      str: word or None if blank.
+
+    Raises:
+      ValueError: if the value is not supported.
+    """
+    if value == '-':
+      return None
+
+    if not value or not self._WORD_CHARACTERS.issuperset(value):
+      raise ValueError('Unsupported word value.')
+
+    return value
+
+  def _ProduceEventDataBatch(self, parser_mediator):
+    """Produces the event data that has not been produced yet.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+    """
+    if self._event_data_batch:
+      parser_mediator.ProduceEventDataBatch(self._event_data_batch)
+      self._event_data_batch = []
+
   def _ResetState(self):
     """Resets stored values."""
+    self._event_data_batch = []
     self._use_local_time = False
 
     self._SetLineStructures(self._LINE_STRUCTURES)
+    self._SetLogLineFields(self._LOG_LINE_1_5_FIELDS)
+
+  def _SetLogLineFields(self, members):
+    """Sets the fields used to parse log lines without the pyparsing grammar.
+
+    Args:
+      members (list[str]): names of the fields in the log line.
+    """
+    self._log_line_fields = []
+    for member in members:
+      # Fields without a definition are parsed as WORD_OR_BLANK and not stored.
+      name, value_type = self._LOG_LINE_FIELDS.get(member, (None, 'word'))
+      self._log_line_fields.append((name, self._value_parsers[value_type]))
+
+  def _SplitCommentLine(self, line):
+    """Splits a comment line into metadata.
+
+    Args:
+      line (str): comment line without end-of-line character.
+
+    Returns:
+      dict[str, str]: values of the metadata per name.
+    """
+    line = line[1:].lstrip(' \t')
+
+    if line.startswith('Fields: '):
+      return {'fields': line[8:]}
+
+    if line.startswith('Time Format: '):
+      return {'time_format': line[13:]}
+
+    return {}
+
+  def _SplitLogLine(self, line):
+    """Splits a log line into fields.
+
+    Args:
+      line (str): log line without end-of-line character.
+
+    Returns:
+      dict[str, object]: values of the fields per name or None if the log line
+          cannot be split into supported field values.
+    """
+    values = line.split(' ')
+    if len(values) != len(self._log_line_fields):
+      return None
+
+    structure = {}
+    try:
+      for (name, parse_value), value in zip(self._log_line_fields, values):
+        value = parse_value(value)
+        if name:
+          structure[name] = value
+
+    except ValueError:
+      return None
+
+    return structure
 
   def CheckRequiredFormat(self, parser_mediator, text_reader):
     """Check if the log record has the minimal structure required by the plugin.
@@ -165,6 +165,39 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
         'recovery_warning')
     self.assertEqual(number_of_warnings, 0)
 
+  def testProduceEventDataBatch(self):
+    """Tests the ProduceEventDataBatch method."""
+    parser_mediator = mediator.ParserMediator()
+
+    storage_writer = fake_writer.FakeStorageWriter()
+    parser_mediator.SetStorageWriter(storage_writer)
+
+    storage_writer.Open()
+
+    event_data_stream = events.EventDataStream()
+    parser_mediator.ProduceEventDataStream(event_data_stream)
+
+    event_data_batch = []
+    for _ in range(3):
+      event_data = events.EventData()
+      event_data._parser_chain = 'test_parser'
+      event_data.data_type = 'test'
+      event_data_batch.append(event_data)
+
+    parser_mediator.ProduceEventDataBatch(event_data_batch)
+
+    number_of_event_data = storage_writer.GetNumberOfAttributeContainers(
+        'event_data')
+    self.assertEqual(number_of_event_data, 3)
+
+    number_of_warnings = storage_writer.GetNumberOfAttributeContainers(
+        'extraction_warning')
+    self.assertEqual(number_of_warnings, 0)
+
+    number_of_warnings = storage_writer.GetNumberOfAttributeContainers(
+        'recovery_warning')
+    self.assertEqual(number_of_warnings, 0)
+
   # TODO: add tests for ProduceEventDataStream.
   # TODO: add tests for ProduceEventSource.
 
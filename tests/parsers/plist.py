@@ -17,6 +17,44 @@ class PlistParserTest(test_lib.ParserTestCase):
 
   # pylint: disable=protected-access
 
+  def testCheckHeader(self):
+    """Tests the _CheckHeader function."""
+    parser = plist.PlistParser()
+
+    result = parser._CheckHeader(b'bplist00')
+    self.assertTrue(result)
+
+    result = parser._CheckHeader(b'<?xml ve')
+    self.assertTrue(result)
+
+    result = parser._CheckHeader(b'\n  <plis')
+    self.assertTrue(result)
+
+    result = parser._CheckHeader(b'\xef\xbb\xbf<?xml')
+    self.assertTrue(result)
+
+    result = parser._CheckHeader(b'MZ\x90\x00\x03\x00\x00\x00')
+    self.assertFalse(result)
+
+  def testGetCachedRequiredFormats(self):
+    """Tests the _GetCachedRequiredFormats function."""
+    parser = plist.PlistParser()
+
+    required_formats = parser._GetCachedRequiredFormats({'a': 1, 'b': 2})
+    self.assertEqual(required_formats, {})
+
+    required_formats['test'] = True
+
+    required_formats = parser._GetCachedRequiredFormats({'b': 3, 'a': 4})
+    self.assertEqual(required_formats, {'test': True})
+
+    required_formats = parser._GetCachedRequiredFormats({'a': 1})
+    self.assertEqual(required_formats, {})
+
+    required_formats = parser._GetCachedRequiredFormats(['a', 'b'])
+    self.assertEqual(required_formats, {})
+    self.assertEqual(len(parser._cached_required_formats), 2)
+
   def testEnablePlugins(self):
     """Tests the EnablePlugins function."""
     parser = plist.PlistParser()
@@ -76,6 +76,36 @@ class EncodedTextReaderTest(test_lib.ParserTestCase):
     text_reader.ReadLines()
     self.assertEqual(text_reader.lines, self._TEST_LINES)
 
+  def testReadLinesWithLargeRecord(self):
+    """Tests the ReadLines function with a record larger than 128 KiB."""
+    test_record = '\n'.join(['Line {0:05d} of a large record'.format(index)
+                             for index in range(6000)])
+    test_lines = '\n'.join(['Header', test_record, 'Footer'])
+
+    resolver_context = dfvfs_context.Context()
+
+    test_path_spec = fake_path_spec.FakePathSpec(location='/file.txt')
+    file_object = fake_file_io.FakeFile(
+        resolver_context, test_path_spec, test_lines.encode('utf-8'))
+    file_object.Open()
+
+    text_reader = text_parser.EncodedTextReader(file_object)
+
+    text_reader.ReadLines()
+    self.assertEqual(text_reader.lines, test_lines)
+
+    line = text_reader.ReadLine()
+    self.assertEqual(line, 'Header')
+
+    text_reader.ReadLines()
+    self.assertEqual(text_reader.lines[:len(test_record)], test_record)
+
+    text_reader.SkipAhead(len(test_record) + 1)
+    self.assertEqual(text_reader.line_number, 6001)
+
+    line = text_reader.ReadLine()
+    self.assertEqual(line, 'Footer')
+
   def testSkipAhead(self):
     """Tests the SkipAhead function."""
     resolver_context = dfvfs_context.Context()
@@ -4,9 +4,62 @@
 
 import unittest
 
+import pyparsing
+
+from plaso.lib import errors
+from plaso.parsers.text_plugins import interface
+
 from tests.parsers import test_lib
 
 
+class TestTextPlugin(interface.TextPlugin):
+  """Text parser plugin for testing."""
+
+  NAME = 'test'
+  DATA_FORMAT = 'Test log file'
+
+  _INTEGER = pyparsing.Word(pyparsing.nums).set_parse_action(
+      lambda tokens: int(tokens[0], 10))
+
+  _END_OF_LINE = pyparsing.Suppress(pyparsing.LineEnd())
+
+  _LOG_LINE = (
+      _INTEGER.set_results_name('value') +
+      pyparsing.Word(pyparsing.alphas).set_results_name('text') +
+      _END_OF_LINE)
+
+  _LINE_STRUCTURES = [('log_line', _LOG_LINE)]
+
+  def __init__(self):
+    """Initializes a text parser plugin."""
+    super(TestTextPlugin, self).__init__()
+    self._SetLineStructures(self._LINE_STRUCTURES)
+
+  def _ParseRecord(self, parser_mediator, key, structure):
+    """Parses a pyparsing structure.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+      key (str): name of the parsed structure.
+      structure (pyparsing.ParseResults): tokens from a parsed log line.
+    """
+    return
+
+  def CheckRequiredFormat(self, parser_mediator, text_reader):
+    """Check if the log record has the minimal structure required by the plugin.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfVFS.
+      text_reader (EncodedTextReader): text reader.
+
+    Returns:
+      bool: True if this is the correct plugin, False otherwise.
+    """
+    return True
+
+
 class TextPluginTest(test_lib.ParserTestCase):
   """Tests for the text plugins interface."""
 
@@ -16,6 +69,34 @@ class TextPluginTest(test_lib.ParserTestCase):
   # TODO: add tests for _GetValueFromStructure
   # TODO: add tests for _ParseLines
   # TODO: add tests for _ParseLineStructure
+
+  def testParseString(self):
+    """Tests the _ParseString function."""
+    plugin = TestTextPlugin()
+
+    key, structure, start, end = plugin._ParseString('1 test\n2 other\n')
+    self.assertEqual(key, 'log_line')
+    self.assertEqual(structure.get('value', None), 1)
+    self.assertEqual(start, 0)
+    self.assertEqual(end, 7)
+
+    # Test a line with a leading tab.
+    key, structure, start, end = plugin._ParseString('\t1 test\n2 other\n')
+    self.assertEqual(key, 'log_line')
+    self.assertEqual(structure.get('text', None), 'test')
+    self.assertEqual(start, 1)
+    self.assertEqual(end, 8)
+
+    # Test a line at an offset in the string.
+    key, structure, start, end = plugin._ParseString('1 test\n2 other\n', 7)
+    self.assertEqual(key, 'log_line')
+    self.assertEqual(structure.get('value', None), 2)
+    self.assertEqual(start, 0)
+    self.assertEqual(end, 8)
+
+    with self.assertRaises(errors.ParseError):
+      plugin._ParseString('bogus\n2 other\n')
+
   # TODO: add tests for _SetLineStructures
   # TODO: add tests for Process
 
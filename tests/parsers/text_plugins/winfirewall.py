@@ -4,6 +4,7 @@
 
 import unittest
 
+from plaso.lib import errors
 from plaso.parsers.text_plugins import winfirewall
 
 from tests.parsers.text_plugins import test_lib
@@ -12,6 +13,87 @@ from tests.parsers.text_plugins import test_lib
 class WinFirewallLogTextPluginTest(test_lib.TextPluginTestCase):
   """Tests for the Windows firewall log text parser plugin."""
 
+  # pylint: disable=protected-access
+
+  def testGetLineStructureKey(self):
+    """Tests the _GetLineStructureKey function."""
+    plugin = winfirewall.WinFirewallLogTextPlugin()
+
+    key = plugin._GetLineStructureKey('#Version: 1.5\n')
+    self.assertEqual(key, 'comment_line')
+
+    key = plugin._GetLineStructureKey(
+        '2005-04-11 08:05:57 DROP UDP 123.45.78.90 255.255.255.255 631 631 '
+        '59 - - - - - - - RECEIVE\n')
+    self.assertEqual(key, 'log_line')
+
+  def testParseIPAddressValue(self):
+    """Tests the _ParseIPAddressValue function."""
+    plugin = winfirewall.WinFirewallLogTextPlugin()
+
+    value = plugin._ParseIPAddressValue('123.45.78.90')
+    self.assertEqual(value, '123.45.78.90')
+
+    value = plugin._ParseIPAddressValue('fe80::1')
+    self.assertEqual(value, 'fe80::1')
+
+    value = plugin._ParseIPAddressValue('::ffff:123.45.78.90')
+    self.assertEqual(value, '::ffff:123.45.78.90')
+
+    value = plugin._ParseIPAddressValue('-')
+    self.assertIsNone(value)
+
+    with self.assertRaises(ValueError):
+      plugin._ParseIPAddressValue('123.45.78.256')
+
+    with self.assertRaises(ValueError):
+      plugin._ParseIPAddressValue('1:2:3:4::5:6:7:8')
+
+  def testParseRecord(self):
+    """Tests the _ParseRecord function."""
+    plugin = winfirewall.WinFirewallLogTextPlugin()
+
+    with self.assertRaises(errors.ParseError):
+      plugin._ParseRecord(None, 'bogus', {})
+
+  def testSplitCommentLine(self):
+    """Tests the _SplitCommentLine function."""
+    plugin = winfirewall.WinFirewallLogTextPlugin()
+
+    structure = plugin._SplitCommentLine(
+        '#Fields: date time action protocol src-ip dst-ip')
+    self.assertEqual(structure, {
+        'fields': 'date time action protocol src-ip dst-ip'})
+
+    structure = plugin._SplitCommentLine('#Time Format: Local')
+    self.assertEqual(structure, {'time_format': 'Local'})
+
+    structure = plugin._SplitCommentLine('#Version: 1.5')
+    self.assertEqual(structure, {})
+
+  def testSplitLogLine(self):
+    """Tests the _SplitLogLine function."""
+    plugin = winfirewall.WinFirewallLogTextPlugin()
+
+    structure = plugin._SplitLogLine(
+        '2005-04-11 08:06:26 DROP TCP 123.45.78.90 123.156.78.90 80 1774 576 A '
+        '123456789 987654321 12345 - - - RECEIVE')
+    self.assertIsNotNone(structure)
+    self.assertEqual(structure['date'], (2005, 4, 11))
+    self.assertEqual(structure['time'], (8, 6, 26))
+    self.assertEqual(structure['destination_ip'], '123.156.78.90')
+    self.assertEqual(structure['destination_port'], 1774)
+    self.assertIsNone(structure['icmp_type'])
+
+    structure = plugin._SplitLogLine(
+        '2005-04-11 08:06:26 DROP TCP 123.45.78.90 123.156.78.90 80 1774 576 A')
+    self.assertIsNone(structure)
+
+    structure = plugin._SplitLogLine(
+        '2005-04-11 08:06:26 DROP TCP 123.45.78.90 bogus 80 1774 576 A '
+        '123456789 987654321 12345 - - - RECEIVE')
+    self.assertIsNone(structure)
+
   def testProcess(self):
     """Tests the Process function."""
     plugin = winfirewall.WinFirewallLogTextPlugin()
@@ -46,6 +128,92 @@ class WinFirewallLogTextPluginTest(test_lib.TextPluginTestCase):
     event_data = storage_writer.GetAttributeContainerByIndex('event_data', 7)
     self.CheckEventData(event_data, expected_event_values)
 
+  def testProcessWithEventDataBatches(self):
+    """Tests the Process function with multiple event data batches."""
+    plugin = winfirewall.WinFirewallLogTextPlugin()
+
+    # Use a small batch size to produce the event data in 3 batches and
+    # the remaining event data in _ParseFinalize().
+    plugin._EVENT_DATA_BATCH_SIZE = 3  # pylint: disable=invalid-name
+
+    storage_writer = self._ParseTextFileWithPlugin(
+        ['windows_firewall_fields.log'], plugin)
+
+    number_of_event_data = storage_writer.GetNumberOfAttributeContainers(
+        'event_data')
+    self.assertEqual(number_of_event_data, 10)
+
+    number_of_warnings = storage_writer.GetNumberOfAttributeContainers(
+        'extraction_warning')
+    self.assertEqual(number_of_warnings, 0)
+
+    self.assertEqual(plugin._event_data_batch, [])
+
+    # Test the event data on either side of the batch boundaries.
+    expected_last_written_times = [
+        (2, '2005-04-11T08:05:02'),
+        (3, '2005-04-11T08:05:03'),
+        (5, '2006-01-01T00:00:00+00:00'),
+        (6, '2006-01-01T00:00:01+00:00'),
+        (8, '2006-01-01T00:00:03+00:00'),
+        (9, '2006-01-01T00:00:04+00:00')]
+
+    for index, expected_last_written_time in expected_last_written_times:
+      expected_event_values = {
+          'data_type': 'windows:firewall_log:entry',
+          'last_written_time': expected_last_written_time}
+
+      event_data = storage_writer.GetAttributeContainerByIndex(
+          'event_data', index)
+      self.CheckEventData(event_data, expected_event_values)
+
+  def testProcessWithFieldsMetadata(self):
+    """Tests the Process function with fields metadata after the header."""
+    plugin = winfirewall.WinFirewallLogTextPlugin()
+    storage_writer = self._ParseTextFileWithPlugin(
+        ['windows_firewall_fields.log'], plugin)
+
+    number_of_event_data = storage_writer.GetNumberOfAttributeContainers(
+        'event_data')
+    self.assertEqual(number_of_event_data, 10)
+
+    number_of_warnings = storage_writer.GetNumberOfAttributeContainers(
+        'extraction_warning')
+    self.assertEqual(number_of_warnings, 0)
+
+    number_of_warnings = storage_writer.GetNumberOfAttributeContainers(
+        'recovery_warning')
+    self.assertEqual(number_of_warnings, 0)
+
+    expected_event_values = {
+        'action': 'OPEN',
+        'data_type': 'windows:firewall_log:entry',
+        'destination_ip': '10.1.1.1',
+        'destination_port': 137,
+        'last_written_time': '2005-04-11T08:05:04',
+        'path': 'SEND',
+        'protocol': 'UDP',
+        'source_ip': '192.168.1.2',
+        'source_port': 137}
+
+    event_data = storage_writer.GetAttributeContainerByIndex('event_data', 4)
+    self.CheckEventData(event_data, expected_event_values)
+
+    # The second header defines different fields.
+    expected_event_values = {
+        'action': 'ALLOW',
+        'data_type': 'windows:firewall_log:entry',
+        'destination_ip': '2.2.2.2',
+        'destination_port': None,
+        'last_written_time': '2006-01-01T00:00:00+00:00',
+        'path': 'SEND',
+        'protocol': None,
+        'source_ip': '1.1.1.1',
+        'source_port': None}
+
+    event_data = storage_writer.GetAttributeContainerByIndex('event_data', 5)
+    self.CheckEventData(event_data, expected_event_values)
+
 
 if __name__ == '__main__':
   unittest.main()